@@ -0,0 +1,109 @@
+import io
+import copy
+from dataclasses import asdict
+import streamlit as st
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib import colors
+
+# ==============================================================================
+# --- PDF Report Generation (Using ReportLab) ---
+# ==============================================================================
+# Imported lazily by the app on first use, so ReportLab stays off the cold-start path
+_STYLES = getSampleStyleSheet()
+TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0,0), (0,-1), colors.lightgrey),
+    ('TEXTCOLOR',(0,0),(-1,-1),colors.black),
+    ('ALIGN', (0,0), (-1,-1), 'LEFT'),
+    ('FONTNAME', (0,0), (-1,-1), 'Helvetica'),
+    ('FONTSIZE', (0,0), (-1,-1), 10),
+    ('BOTTOMPADDING', (0,0), (-1,-1), 6),
+    ('GRID', (0,0), (-1,-1), 1, colors.black)
+])
+_TITLE = Paragraph("Centrifugal Pump Sizing Report", _STYLES['h1'])
+
+# Report rows as (label, format template). Each section's templates are joined once, so a report
+# formats a whole section with a single format_map call.
+_SEP = "\x1f"
+def _compile_section(rows):
+    return tuple(label for label, _ in rows), _SEP.join(template for _, template in rows).format_map
+
+_INPUT_SECTION = _compile_section((
+    ("Fluid Template", "{fluid_template}"),
+    ("Flow Rate (m³/hr)", "{flow_rate:.2f}"),
+    ("Fluid Density (kg/m³)", "{density:.2f}"),
+    ("Fluid Viscosity (cP)", "{viscosity:.2f}"),
+    ("Vapor Pressure (kPa, abs)", "{vapor_pressure:.2f}"),
+    ("Source Pressure (kPa, gauge)", "{source_pressure:.2f}"),
+    ("Destination Pressure (kPa, gauge)", "{dest_pressure:.2f}"),
+    ("Elevation Change (m)", "{elevation_change:.2f}"),
+    ("Pipe Material", "{pipe_material}"),
+    ("Suction Pipe Dia. (mm)", "{suction_pipe_dia:.2f}"),
+    ("Suction Pipe Len. (m)", "{suction_pipe_len:.2f}"),
+    ("Discharge Pipe Dia. (mm)", "{discharge_pipe_dia:.2f}"),
+    ("Discharge Pipe Len. (m)", "{discharge_pipe_len:.2f}"),
+    ("Liquid Level Above Suction (m)", "{liquid_level:.2f}"),
+    ("Pump Efficiency", "{pump_eff:.2%}"),
+    ("Motor Efficiency", "{motor_eff:.2%}"),
+))
+_RESULTS_SECTION = _compile_section((
+    ("Total Dynamic Head (TDH)", "{tdh_m:.2f} m"),
+    ("Recommended Motor Size", "{recommended_motor_kW:.2f} kW"),
+    ("NPSH Available (NPSHa)", "{npsha_m:.2f} m"),
+))
+_DETAILS_SECTION = _compile_section((
+    ("Static Head", "{static_head_m:.2f} m"),
+    ("Pressure Head", "{pressure_head_m:.2f} m"),
+    ("Friction Head", "{friction_head_m:.2f} m"),
+    ("Hydraulic Power", "{hydraulic_power_kW:.2f} kW"),
+    ("Brake Horsepower (Shaft)", "{brake_horsepower_kW:.2f} kW"),
+    ("Motor Power Required", "{motor_power_required_kW:.2f} kW"),
+    ("Velocity (Discharge Pipe)", "{velocity_m_s:.2f} m/s"),
+    ("Reynolds Number", "{reynolds_number:.0f} ({flow_regime})"),
+))
+
+@st.cache_data(max_entries=16)
+def create_pdf_report(inputs, results, generated_at):
+    """Generates a PDF report using ReportLab and returns its bytes. generated_at is the timestamp text printed in the header."""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
+    
+    Story = []
+
+    # --- Header ---
+    # The title markup is parsed once; each build gets a shallow copy since wrap() stores layout state on the flowable
+    title = copy.copy(_TITLE)
+    timestamp = Paragraph(f'Generated on: {generated_at}', _STYLES['Normal'])
+    Story.append(title)
+    Story.append(timestamp)
+    Story.append(Spacer(1, 0.25*inch))
+
+    # --- Sections are emitted as title rows of a single table (one flowable to lay out) ---
+    rows, title_rows = [], []
+    def create_section(title_text, data_dict):
+        title_rows.append(len(rows))
+        rows.append([title_text, ""])
+        rows.extend([key, value] for key, value in data_dict.items())
+
+    for title_text, (labels, fmt), values in (("1. Input Parameters", _INPUT_SECTION, asdict(inputs)),
+                                              ("2. Key Results", _RESULTS_SECTION, results),
+                                              ("3. Detailed Calculation Breakdown", _DETAILS_SECTION, results)):
+        create_section(title_text, dict(zip(labels, fmt(values).split(_SEP))))
+
+    # Fixed row heights (what the 10pt body / 12pt title styles measure to) skip ReportLab's per-cell height pass
+    row_heights = [28 if r in title_rows else 21 for r in range(len(rows))]
+    table = Table(rows, colWidths=[2.5*inch, 3.5*inch], rowHeights=row_heights)
+    table.setStyle(TABLE_STYLE)
+    table.setStyle(TableStyle([cmd for r in title_rows for cmd in (
+        ('SPAN', (0,r), (1,r)),
+        ('BACKGROUND', (0,r), (1,r), colors.white),
+        ('FONTNAME', (0,r), (1,r), 'Helvetica-Bold'),
+        ('FONTSIZE', (0,r), (1,r), 12),
+        ('TOPPADDING', (0,r), (1,r), 10),
+    )]))
+    Story.append(table)
+    
+    doc.build(Story)
+    return buffer.getvalue()
@@ -0,0 +1,184 @@
+import sys
+import math
+import bisect
+import numpy as np
+from functools import lru_cache
+from dataclasses import dataclass, field
+from collections import namedtuple
+from collections.abc import Mapping
+from types import MappingProxyType
+
+# ==============================================================================
+# --- Friction & Geometry Helpers ---
+# ==============================================================================
+_INV_LN10 = 1.0 / math.log(10.0)
+_KW = 0.001  # W -> kW
+
+@lru_cache(maxsize=128)
+def _pipe_area_m2(pipe_dia_mm):
+    pipe_dia_m = pipe_dia_mm * 1e-3
+    return math.pi * pipe_dia_m * pipe_dia_m * 0.25
+
+def _ff(reynolds, pipe_dia_m, epsilon):
+    # Haaland explicit approximation of Colebrook-White (turbulent flow); plain floats in and out
+    a = (epsilon / (3.7 * pipe_dia_m)) ** 1.11
+    b = 6.9 / reynolds
+    return (1.0 / (-1.8 * math.log(a + b) * _INV_LN10)) ** 2
+
+@lru_cache(maxsize=2048)
+def _friction_factor(re_bucket, pipe_dia_mm, material_idx):
+    pipe_dia_m = pipe_dia_mm * 1e-3
+    if pipe_dia_m == 0: return 0
+    return _ff(re_bucket, pipe_dia_m, PumpSizer._ROUGHNESS[material_idx])
+
+PipeLosses = namedtuple('PipeLosses', 'velocity reynolds friction_head')
+
+# ==============================================================================
+# --- PumpSizer Class ---
+# ==============================================================================
+@dataclass(slots=True)
+class PumpSizer:
+    """Pump sizing calculations. The constructor takes SI units (m³/s, kg/m³, Pa·s); from_user_units takes the app's m³/hr, kg/m³ and cP."""
+    PIPE_ROUGHNESS = MappingProxyType({sys.intern(k): v for k, v in {'stainless_steel': 2e-06, 'commercial_steel': 4.5e-05, 'pvc': 1.5e-06, 'cast_iron': 0.00026, 'hdpe': 1.5e-06}.items()})
+    PIPE_MATERIALS = tuple(PIPE_ROUGHNESS)
+    # Roughness by material index; unknown materials fall back to commercial steel
+    _MATERIAL_IDX = MappingProxyType({k: i for i, k in enumerate(PIPE_MATERIALS)})
+    _ROUGHNESS = tuple(PIPE_ROUGHNESS.values())
+    _DEFAULT_MATERIAL_IDX = _MATERIAL_IDX['commercial_steel']
+    FITTINGS_K_VALUES = MappingProxyType({'elbow_90_std': 0.9, 'elbow_90_long_radius': 0.6, 'elbow_45_std': 0.4, 'gate_valve_fully_open': 0.2, 'ball_valve_fully_open': 0.1, 'globe_valve_fully_open': 10.0, 'check_valve_swing': 2.5, 'tee_through_flow': 0.6, 'tee_branch_flow': 1.8, 'pipe_entrance_sharp': 0.5, 'pipe_exit_sharp': 1.0})
+    _FITTING_KEYS = tuple(FITTINGS_K_VALUES)
+    _FITTING_KS = tuple(FITTINGS_K_VALUES.values())
+    _K_VEC = np.array(_FITTING_KS, dtype=np.float64)
+    STANDARD_MOTOR_KW = (0.37, 0.55, 0.75, 1.1, 1.5, 2.2, 3, 4, 5.5, 7.5, 11, 15, 18.5, 22, 30, 37, 45, 55, 75, 90, 110, 132, 160, 200, 250)
+    GRAVITY = 9.81
+    _INV_2G = 1.0 / (2 * GRAVITY)
+    flow_rate_m3_s: float
+    density: float
+    viscosity_Pa_s: float
+    results: dict = field(default_factory=dict)
+    _rho_g: float = field(init=False, repr=False)
+    _kpa_to_head: float = field(init=False, repr=False)
+    def __post_init__(self):
+        if self.density <= 0: self.density = 1
+        self._rho_g = self.density * self.GRAVITY
+        self._kpa_to_head = 1000.0 / self._rho_g
+    @classmethod
+    def from_user_units(cls, flow_rate_m3_hr, fluid_density_kg_m3, fluid_viscosity_cP):
+        return cls(flow_rate_m3_hr / 3600.0, fluid_density_kg_m3, fluid_viscosity_cP / 1000.0)
+    def _calculate_velocity(self, pipe_dia_mm):
+        return self.flow_rate_m3_s / _pipe_area_m2(pipe_dia_mm) if pipe_dia_mm else 0.0
+    def _calculate_reynolds(self, velocity, pipe_dia_mm):
+        pipe_dia_m = pipe_dia_mm * 1e-3
+        if self.viscosity_Pa_s == 0: return float('inf')
+        return (self.density * velocity * pipe_dia_m) / self.viscosity_Pa_s
+    def _calculate_friction_factor(self, reynolds, pipe_dia_mm, pipe_material):
+        if reynolds < 2300: return 64 / reynolds if reynolds > 0 else 0
+        # Turbulent f varies slowly with Re, so bucket it to the nearest 100 to share cache entries
+        return _friction_factor(round(reynolds, -2), pipe_dia_mm, self._MATERIAL_IDX.get(pipe_material, self._DEFAULT_MATERIAL_IDX))
+    def _sum_k(self, fittings):
+        # fittings is either a {name: count} mapping or a sequence of counts in _FITTING_KEYS order.
+        # Non-positive counts are ignored; an unknown fitting name with a positive count raises KeyError.
+        if isinstance(fittings, Mapping):
+            return float(sum(self.FITTINGS_K_VALUES[key] * count for key, count in fittings.items() if count > 0))
+        return float(self._K_VEC @ np.maximum(np.asarray(fittings, dtype=np.float64), 0.0))
+    def _pipe_losses(self, pipe_dia_mm, pipe_length_m, pipe_material, fittings):
+        pipe_dia_m = pipe_dia_mm * 1e-3
+        velocity = self._calculate_velocity(pipe_dia_mm)
+        reynolds = self._calculate_reynolds(velocity, pipe_dia_mm)
+        friction_factor = self._calculate_friction_factor(reynolds, pipe_dia_mm, pipe_material)
+        velocity_head = velocity * velocity * self._INV_2G
+        pipe_loss = friction_factor * (pipe_length_m / pipe_dia_m) * velocity_head if pipe_dia_m > 0 else 0
+        return PipeLosses(velocity, reynolds, pipe_loss + self._sum_k(fittings) * velocity_head)
+    def _discharge_heads(self, discharge_pipe_dia_mm, total_pipe_length_m, pipe_material, fittings, elevation_change_m, source_pressure_kpa_g, dest_pressure_kpa_g):
+        static_head = elevation_change_m
+        pressure_head = (dest_pressure_kpa_g - source_pressure_kpa_g) * self._kpa_to_head
+        velocity, reynolds, friction_head = self._pipe_losses(discharge_pipe_dia_mm, total_pipe_length_m, pipe_material, fittings)
+        tdh = static_head + pressure_head + friction_head
+        return {'tdh_m': tdh, 'static_head_m': static_head, 'pressure_head_m': pressure_head, 'friction_head_m': friction_head, 'velocity_m_s': velocity, 'reynolds_number': reynolds}
+    def calculate_tdh(self, suction_pipe_dia_mm, discharge_pipe_dia_mm, total_pipe_length_m, pipe_material, fittings, elevation_change_m, source_pressure_kpa_g, dest_pressure_kpa_g):
+        heads = self._discharge_heads(discharge_pipe_dia_mm, total_pipe_length_m, pipe_material, fittings, elevation_change_m, source_pressure_kpa_g, dest_pressure_kpa_g)
+        self.results.update(heads)
+        return heads['tdh_m']
+    def _friction_factor_vec(self, reynolds, pipe_dia_m, pipe_material):
+        epsilon = self._ROUGHNESS[self._MATERIAL_IDX.get(pipe_material, self._DEFAULT_MATERIAL_IDX)]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            laminar = np.where(reynolds > 0, 64 / reynolds, 0.0)
+            # Same Re bucketing as the scalar path, so the curve passes through the reported design point
+            turbulent = (1.0 / (-1.8 * np.log((epsilon / (3.7 * pipe_dia_m)) ** 1.11 + 6.9 / np.round(reynolds, -2)) * _INV_LN10)) ** 2
+        return np.where(reynolds < 2300, laminar, turbulent)
+    def sweep(self, flow_rate_m3_hr, discharge_pipe_dia_mm, total_pipe_length_m, pipe_material, fittings, elevation_change_m, source_pressure_kpa_g, dest_pressure_kpa_g):
+        """Vectorized TDH over arrays of flow rates and/or discharge diameters (broadcast together).
+
+        Units match the app inputs, not the constructor: flow in m³/hr (self.flow_rate_m3_s is ignored), diameter in mm, length and
+        elevation in m, pressures in kPa gauge; fittings as in _sum_k. Returns arrays keyed like the TDH results, plus the swept inputs.
+        """
+        flow_rate_m3_hr, discharge_pipe_dia_mm = np.broadcast_arrays(np.asarray(flow_rate_m3_hr, dtype=np.float64), np.asarray(discharge_pipe_dia_mm, dtype=np.float64))
+        flow_rate_m3_s = flow_rate_m3_hr / 3600.0
+        pipe_dia_m = discharge_pipe_dia_mm * 1e-3
+        velocity = flow_rate_m3_s / (np.pi * pipe_dia_m ** 2 / 4.0)
+        reynolds = (self.density * velocity * pipe_dia_m) / self.viscosity_Pa_s if self.viscosity_Pa_s > 0 else np.full_like(velocity, np.inf)
+        friction_factor = self._friction_factor_vec(reynolds, pipe_dia_m, pipe_material)
+        velocity_head = velocity * velocity * self._INV_2G
+        friction_head = (friction_factor * (total_pipe_length_m / pipe_dia_m) + self._sum_k(fittings)) * velocity_head
+        pressure_head = (dest_pressure_kpa_g - source_pressure_kpa_g) * self._kpa_to_head
+        tdh = elevation_change_m + pressure_head + friction_head
+        return {'flow_rate_m3_hr': flow_rate_m3_hr, 'discharge_pipe_dia_mm': discharge_pipe_dia_mm, 'velocity_m_s': velocity, 'reynolds_number': reynolds, 'friction_head_m': friction_head, 'tdh_m': tdh}
+    def calculate_power(self, tdh_m, pump_efficiency=0.75, motor_efficiency=0.9):
+        self.results.update(self._power_results(tdh_m, pump_efficiency, motor_efficiency))
+        return self.results
+    def _power_results(self, tdh_m, pump_efficiency=0.75, motor_efficiency=0.9):
+        hydraulic_power_W = self.flow_rate_m3_s * self._rho_g * tdh_m
+        bhp_W = hydraulic_power_W / pump_efficiency if pump_efficiency > 0 else float('inf')
+        motor_power_W = bhp_W / motor_efficiency if motor_efficiency > 0 else float('inf')
+        motor_power_kW = motor_power_W * _KW
+        idx = bisect.bisect_left(self.STANDARD_MOTOR_KW, motor_power_kW)
+        recommended_motor_kW = self.STANDARD_MOTOR_KW[idx] if idx < len(self.STANDARD_MOTOR_KW) else self.STANDARD_MOTOR_KW[-1]
+        return {'hydraulic_power_kW': hydraulic_power_W * _KW, 'brake_horsepower_kW': bhp_W * _KW, 'motor_power_required_kW': motor_power_kW, 'recommended_motor_kW': recommended_motor_kW}
+    def _npsha(self, suction_pipe_dia_mm, suction_pipe_length_m, suction_pipe_material, suction_fittings, liquid_level_above_suction_m, suction_vessel_pressure_kpa_g, liquid_vapor_pressure_kpa_abs):
+        pressure_head_at_source = (suction_vessel_pressure_kpa_g + 101.325) * self._kpa_to_head
+        vapor_pressure_head = liquid_vapor_pressure_kpa_abs * self._kpa_to_head
+        total_suction_friction_head = self._pipe_losses(suction_pipe_dia_mm, suction_pipe_length_m, suction_pipe_material, suction_fittings).friction_head
+        return pressure_head_at_source + liquid_level_above_suction_m - vapor_pressure_head - total_suction_friction_head
+    def calculate_npsha(self, suction_pipe_dia_mm, suction_pipe_length_m, suction_pipe_material, suction_fittings, liquid_level_above_suction_m, suction_vessel_pressure_kpa_g, liquid_vapor_pressure_kpa_abs):
+        npsha = self._npsha(suction_pipe_dia_mm, suction_pipe_length_m, suction_pipe_material, suction_fittings, liquid_level_above_suction_m, suction_vessel_pressure_kpa_g, liquid_vapor_pressure_kpa_abs)
+        self.results['npsha_m'] = npsha
+        return npsha
+    def solve(self, *, suction_kwargs, discharge_kwargs, power_kwargs):
+        """Computes TDH, power and NPSHa in one pass. The kwargs use the parameter names of _npsha, _discharge_heads and calculate_power.
+
+        Each call builds and returns a fresh results dict without touching self.results, so one (cached) instance can be shared between sessions.
+        """
+        results = self._discharge_heads(**discharge_kwargs)
+        results['npsha_m'] = self._npsha(**suction_kwargs)
+        results.update(self._power_results(results['tdh_m'], **power_kwargs))
+        return results
+
+# ==============================================================================
+# --- UI Labels ---
+# ==============================================================================
+# Kept outside PumpSizer (the calculations never use them) but in this module so they are built once per process
+FITTING_DISPLAY_NAMES = MappingProxyType({name: name.replace('_', ' ').title() for name in PumpSizer.FITTINGS_K_VALUES})
+
+# ==============================================================================
+# --- Report Input Snapshot ---
+# ==============================================================================
+# Defined here rather than in the app script so the class is created once per process, not on every rerun
+@dataclass(slots=True, frozen=True)
+class ReportInputs:
+    """The input values shown in the report, snapshotted when Calculate is clicked."""
+    fluid_template: str
+    flow_rate: float
+    density: float
+    viscosity: float
+    vapor_pressure: float
+    source_pressure: float
+    dest_pressure: float
+    elevation_change: float
+    pipe_material: str
+    suction_pipe_dia: float
+    suction_pipe_len: float
+    discharge_pipe_dia: float
+    discharge_pipe_len: float
+    liquid_level: float
+    pump_eff: float
+    motor_eff: float